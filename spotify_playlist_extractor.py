@@ -28,16 +28,89 @@ import os
 import sys
 import re
 import json
+import csv
 import base64
+import hashlib
+import importlib.util
 import argparse
+import asyncio
 import subprocess
 import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional, Tuple
 
+try:
+    import aiohttp
+except ImportError:  # Optional: remaining playlist pages are then fetched with a thread pool
+    aiohttp = None
+
+# Directory for data cached between runs (access tokens, playlist snapshots)
+_CACHE_DIR = Path.home() / ".cache" / "spotify_playlist_extractor"
+
+# Maximum number of playlist items returned per page by the Spotify API
+_PAGE_SIZE = 100
+# Number of playlist pages fetched concurrently once the track total is known
+_PAGE_FETCH_WORKERS = 4
+
+# Spotify web URL of a track, completed by its ID
+_TRACK_URL_PREFIX = "https://open.spotify.com/track/"
+
+# Number of track URLs checked concurrently before downloading
+_PREFLIGHT_WORKERS = 8
+
+# Track fields requested per playlist item: just enough to build URLs, or everything the outputs use
+_TRACK_FIELDS = {
+    "minimal": "external_urls(spotify),id",
+    "full": "external_urls,name,artists(name),id,uri",
+}
+
+# Playlist ID from a Spotify URI, web URL, or a bare ID
+_PLAYLIST_ID_RE = re.compile(r"(?:spotify:playlist:|spotify\.com/playlist/)([a-zA-Z0-9]+)|^([a-zA-Z0-9]+)$")
+
+# Maximum number of track URLs passed to one spotdl process, keeping the command line
+# well below the Windows limit of 32,767 characters
+_BATCH_SIZE = 200
+
+# spotDL output lines reporting a finished or skipped track
+_SPOTDL_DONE_RE = re.compile(r'^(?:Downloaded "|Skipping )')
+# spotDL output lines reporting a track that could not be downloaded
+_SPOTDL_ERROR_RE = re.compile(r'(?:LookupError|AudioProviderError|DownloaderError)')
+
+
+def _write_stderr(lines: List[str]):
+    """Write several log lines to stderr with a single write and flush."""
+    if lines:
+        sys.stderr.write("\n".join(lines) + "\n")
+        sys.stderr.flush()
+
+
+def _read_json_cache(path: Path) -> Optional[Dict]:
+    """Read a JSON object from a cache file, or None if it is missing, unreadable or not an object."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if isinstance(cached, dict) else None
+
+
+def _write_private_json(path: Path, data: Dict):
+    """Write data as JSON to a file readable only by the user, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
 
 class SpotifyPlaylistExtractor:
     """Extracts track URLs from Spotify playlists using the Web API."""
@@ -47,15 +120,38 @@ class SpotifyPlaylistExtractor:
         self.client_id = client_id
         self.client_secret = client_secret
         self.access_token: Optional[str] = None
+        self.token_expires_at: Optional[float] = None
+        self._token_from_cache = False
+        self._auth_lock = threading.Lock()
         self.base_url = "https://api.spotify.com/v1"
         
+        # Reuse connections across requests and retry rate-limited or failed calls
+        self.session = requests.Session()
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self.session.mount("https://", adapter)
+        
     def authenticate(self) -> bool:
         """
         Authenticate using Client Credentials flow.
         
+        A token cached on disk by a previous run is reused until it expires or
+        Spotify rejects it.
+        
         Returns:
             bool: True if authentication successful, False otherwise
         """
+        if self._load_cached_token():
+            self._token_from_cache = True
+            self._set_session_token()
+            print("✓ Using cached Spotify API token", file=sys.stderr)
+            return True
+        
         # Prepare the authorization header
         auth_string = f"{self.client_id}:{self.client_secret}"
         auth_bytes = auth_string.encode("ascii")
@@ -70,13 +166,18 @@ class SpotifyPlaylistExtractor:
         data = {"grant_type": "client_credentials"}
         
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=headers, data=data)
             response.raise_for_status()
             
             token_info = response.json()
             self.access_token = token_info.get("access_token")
             
             if self.access_token:
+                # Expire the cached token a minute early to avoid using it mid-request
+                self.token_expires_at = time.time() + token_info.get("expires_in", 3600) - 60
+                self._token_from_cache = False
+                self._save_cached_token()
+                self._set_session_token()
                 print("✓ Successfully authenticated with Spotify API", file=sys.stderr)
                 return True
             else:
@@ -87,6 +188,76 @@ class SpotifyPlaylistExtractor:
             print(f"✗ Authentication failed: {e}", file=sys.stderr)
             return False
     
+    def _set_session_token(self):
+        """Send the current access token with every subsequent API request."""
+        self.session.headers.update({"Authorization": f"Bearer {self.access_token}"})
+    
+    def _token_cache_path(self) -> Path:
+        """Return the token cache file for the configured client ID."""
+        client_hash = hashlib.sha256(self.client_id.encode("utf-8")).hexdigest()
+        return _CACHE_DIR / f"token-{client_hash}.json"
+    
+    def _load_cached_token(self) -> bool:
+        """
+        Load a still valid access token from the cache file.
+        
+        Returns:
+            bool: True if a cached token was loaded, False otherwise
+        """
+        cached = _read_json_cache(self._token_cache_path())
+        if cached is None:
+            return False
+        access_token = cached.get("access_token")
+        expires_at = cached.get("expires_at")
+        if not isinstance(access_token, str) or not access_token:
+            return False
+        if isinstance(expires_at, bool) or not isinstance(expires_at, (int, float)):
+            return False
+        if expires_at <= time.time():
+            return False
+        
+        self.access_token = access_token
+        self.token_expires_at = expires_at
+        return True
+    
+    def _refresh_rejected_token(self, rejected_token: Optional[str]) -> bool:
+        """
+        Replace a cached access token that Spotify rejected with a fresh one.
+        
+        A cached token can be rejected before its recorded expiry, e.g. after the
+        credentials were rotated. Only cached tokens are replaced, at most once.
+        
+        Args:
+            rejected_token: Access token sent with the rejected request
+            
+        Returns:
+            bool: True if the request should be retried with the current token
+        """
+        with self._auth_lock:
+            # Another thread already replaced the token
+            if self.access_token != rejected_token:
+                return True
+            if not self._token_from_cache:
+                return False
+            
+            print("Cached Spotify API token was rejected, authenticating again", file=sys.stderr)
+            try:
+                self._token_cache_path().unlink()
+            except OSError:
+                pass
+            self._token_from_cache = False
+            return self.authenticate()
+    
+    def _save_cached_token(self):
+        """Write the current access token to the cache file, readable only by the user."""
+        try:
+            _write_private_json(
+                self._token_cache_path(),
+                {"access_token": self.access_token, "expires_at": self.token_expires_at}
+            )
+        except OSError as e:
+            print(f"Warning: Could not cache access token: {e}", file=sys.stderr)
+    
     def extract_playlist_id(self, playlist_url: str) -> Optional[str]:
         """
         Extract playlist ID from Spotify URL.
@@ -97,31 +268,42 @@ class SpotifyPlaylistExtractor:
         Returns:
             str: Playlist ID if found, None otherwise
         """
-        # Handle different Spotify URL formats
-        patterns = [
-            r"spotify:playlist:([a-zA-Z0-9]+)",  # Spotify URI format
-            r"open\.spotify\.com/playlist/([a-zA-Z0-9]+)",  # Web URL format
-            r"spotify\.com/playlist/([a-zA-Z0-9]+)",  # Alternative web format
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, playlist_url)
-            if match:
-                return match.group(1)
+        # Handles URI, web URL (open.spotify.com or spotify.com) and bare ID formats in one scan
+        match = _PLAYLIST_ID_RE.search(playlist_url)
+        if match:
+            return match.group(1) or match.group(2)
         
-        # If it's just an ID
-        if re.match(r"^[a-zA-Z0-9]+$", playlist_url):
-            return playlist_url
-            
         return None
     
-    def get_playlist_tracks(self, playlist_id: str, added_after: Optional[str] = None) -> List[Dict]:
+    def get_playlist_tracks(self, playlist_id: str, added_after: Optional[str] = None, fields: str = "minimal") -> List[Dict]:
         """
         Get all tracks from a playlist using pagination.
         
         Args:
             playlist_id: Spotify playlist ID
             added_after: Optional date filter (YYYY-MM-DD format)
+            fields: Track fields to request: 'minimal' (URL and ID only) or 'full'
+                (also name, artists and URI)
+            
+        Returns:
+            List[Dict]: List of track objects (with added_at info if filtering)
+        """
+        tracks, _ = self._fetch_playlist_tracks(playlist_id, added_after, fields)
+        return tracks
+    
+    def get_playlist_tracks_cached(self, playlist_id: str, added_after: Optional[str] = None, fields: str = "minimal") -> List[Dict]:
+        """
+        Get all tracks from a playlist, reusing the result of a previous run if unchanged.
+        
+        The playlist's snapshot_id only changes when the playlist is modified, so a
+        cached track list with the same snapshot_id can be returned without paging
+        through the playlist again.
+        
+        Args:
+            playlist_id: Spotify playlist ID
+            added_after: Optional date filter (YYYY-MM-DD format)
+            fields: Track fields to request: 'minimal' (URL and ID only) or 'full'
+                (also name, artists and URI)
             
         Returns:
             List[Dict]: List of track objects (with added_at info if filtering)
@@ -129,68 +311,277 @@ class SpotifyPlaylistExtractor:
         if not self.access_token:
             raise ValueError("Not authenticated. Call authenticate() first.")
         
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        try:
+            snapshot = self._get_json(f"{self.base_url}/playlists/{playlist_id}", {"fields": "snapshot_id"})
+            snapshot_id = snapshot.get("snapshot_id")
+        except requests.RequestException as e:
+            print(f"Warning: Could not fetch playlist snapshot: {e}", file=sys.stderr)
+            snapshot_id = None
+        
+        if not snapshot_id:
+            return self.get_playlist_tracks(playlist_id, added_after, fields)
+        
+        cache_path = _CACHE_DIR / "playlists" / f"{playlist_id}.json"
+        cached = _read_json_cache(cache_path)
+        if cached is None or not isinstance(cached.get("tracks"), list):
+            cached = {}
+        
+        # A cached 'full' track list also serves 'minimal' requests
+        if (cached.get("snapshot_id") == snapshot_id
+                and cached.get("added_after") == added_after
+                and cached.get("fields") in (fields, "full")):
+            tracks = [track for track in cached["tracks"] if isinstance(track, dict)]
+            print(f"✓ Playlist unchanged since last run, using {len(tracks)} cached tracks", file=sys.stderr)
+            return tracks
+        
+        tracks, complete = self._fetch_playlist_tracks(playlist_id, added_after, fields)
+        
+        # Never cache a track list that is missing pages
+        if complete:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump({
+                        "snapshot_id": snapshot_id,
+                        "added_after": added_after,
+                        "fields": fields,
+                        "tracks": tracks
+                    }, f)
+            except OSError as e:
+                print(f"Warning: Could not cache playlist tracks: {e}", file=sys.stderr)
+        
+        return tracks
+    
+    def _fetch_playlist_tracks(self, playlist_id: str, added_after: Optional[str], fields: str) -> Tuple[List[Dict], bool]:
+        """
+        Page through a playlist and collect its tracks.
+        
+        Args:
+            playlist_id: Spotify playlist ID
+            added_after: Optional date filter (YYYY-MM-DD format)
+            fields: Track fields mode, a key of _TRACK_FIELDS
+            
+        Returns:
+            Tuple[List[Dict], bool]: (track objects, True if every page was retrieved)
+        """
+        if not self.access_token:
+            raise ValueError("Not authenticated. Call authenticate() first.")
+        if fields not in _TRACK_FIELDS:
+            raise ValueError(f"Unknown fields mode: {fields}")
         
         all_tracks = []
         url = f"{self.base_url}/playlists/{playlist_id}/tracks"
         
         # Include added_at field if we need to filter by date
+        track_fields = _TRACK_FIELDS[fields]
         if added_after:
-            fields = "items(added_at,track(external_urls,name,artists(name),id,uri,href)),next,total"
+            fields_mask = f"items(added_at,track({track_fields})),next,total"
         else:
-            fields = "items(track(external_urls,name,artists(name),id,uri,href)),next,total"
+            fields_mask = f"items(track({track_fields})),next,total"
         
         # Parameters for the request
         params = {
-            "fields": fields,
-            "limit": 100,  # Maximum allowed
+            "fields": fields_mask,
+            "limit": _PAGE_SIZE,
             "offset": 0
         }
         
-        total_tracks = None
+        complete = False
+        try:
+            data = self._get_json(url, params, conditional=False)
+        except requests.RequestException as e:
+            print(f"✗ Error fetching tracks: {e}", file=sys.stderr)
+            data = None
         
-        while url:
-            try:
-                response = requests.get(url, headers=headers, params=params if url == f"{self.base_url}/playlists/{playlist_id}/tracks" else None)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if total_tracks is None:
-                    total_tracks = data.get("total", 0)
-                    print(f"Found {total_tracks} tracks in playlist", file=sys.stderr)
-                
-                # Extract tracks from this page
-                items = data.get("items", [])
-                for item in items:
-                    track = item.get("track")
-                    if track and track.get("id"):  # Skip null/deleted tracks
-                        # If filtering by date, check the added_at field
-                        if added_after:
-                            added_at = item.get("added_at")
-                            if added_at and self._is_track_added_after(added_at, added_after):
-                                all_tracks.append(track)
-                        else:
-                            all_tracks.append(track)
-                
-                # Check for next page
-                url = data.get("next")
-                params = None  # For subsequent requests, params are included in the URL
-                
+        if data is not None:
+            total_tracks = data.get("total", 0)
+            self._collect_page_tracks(data, added_after, all_tracks)
+            _write_stderr([
+                f"Found {total_tracks} tracks in playlist",
+                f"Retrieved {len(all_tracks)}/{total_tracks} tracks..."
+            ])
+            
+            # The total is known now, so the remaining pages can be requested concurrently
+            offsets = range(_PAGE_SIZE, total_tracks, _PAGE_SIZE)
+            pages = None
+            use_async = aiohttp is not None and bool(offsets)
+            if use_async:
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    pass
+                else:
+                    # asyncio.run() cannot nest inside a running loop (e.g. Jupyter)
+                    use_async = False
+            if use_async:
+                try:
+                    pages = asyncio.run(self._fetch_pages_async(url, params, offsets))
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    print(f"Warning: Async page fetch failed, retrying with thread pool: {e}", file=sys.stderr)
+            
+            if pages is not None:
+                for data in pages:
+                    self._collect_page_tracks(data, added_after, all_tracks)
                 print(f"Retrieved {len(all_tracks)}/{total_tracks} tracks...", file=sys.stderr)
-                
-            except requests.RequestException as e:
-                print(f"✗ Error fetching tracks: {e}", file=sys.stderr)
-                break
+                complete = True
+            else:
+                complete = self._fetch_pages_threaded(url, params, offsets, added_after, all_tracks, total_tracks)
         
         if added_after:
             print(f"✓ Retrieved {len(all_tracks)} tracks total (filtered by date: after {added_after})", file=sys.stderr)
         else:
             print(f"✓ Retrieved {len(all_tracks)} tracks total", file=sys.stderr)
-        return all_tracks
+        return all_tracks, complete
+    
+    def _fetch_pages_threaded(self, url: str, params: Dict, offsets: range, added_after: Optional[str],
+                              all_tracks: List[Dict], total_tracks: int) -> bool:
+        """
+        Fetch playlist pages concurrently with a thread pool sharing the session.
+        
+        Args:
+            url: Playlist tracks URL
+            params: Query parameters of the first page
+            offsets: Offsets of the pages to fetch
+            added_after: Optional date filter (YYYY-MM-DD format)
+            all_tracks: List the matching track objects are appended to
+            total_tracks: Total number of tracks in the playlist, for progress output
+            
+        Returns:
+            bool: True if every page was retrieved
+        """
+        with ThreadPoolExecutor(max_workers=_PAGE_FETCH_WORKERS) as executor:
+            pages = executor.map(
+                lambda offset: self._get_json(url, dict(params, offset=offset), conditional=False), offsets
+            )
+            try:
+                # Pages are yielded in offset order, keeping the playlist order intact
+                for data in pages:
+                    self._collect_page_tracks(data, added_after, all_tracks)
+                    print(f"Retrieved {len(all_tracks)}/{total_tracks} tracks...", file=sys.stderr)
+            except requests.RequestException as e:
+                print(f"✗ Error fetching tracks: {e}", file=sys.stderr)
+                executor.shutdown(cancel_futures=True)
+                return False
+        
+        return True
+    
+    async def _fetch_pages_async(self, url: str, params: Dict, offsets: range) -> List[Dict]:
+        """
+        Fetch playlist pages concurrently with aiohttp.
+        
+        Args:
+            url: Playlist tracks URL
+            params: Query parameters of the first page
+            offsets: Offsets of the pages to fetch
+            
+        Returns:
+            List[Dict]: Pages in offset order
+            
+        Raises:
+            aiohttp.ClientError: If any request fails
+            ValueError: If a response body is not valid JSON
+        """
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        connector = aiohttp.TCPConnector(limit=8)
+        
+        # trust_env picks up proxy settings from the environment, like requests does
+        async with aiohttp.ClientSession(connector=connector, headers=headers, trust_env=True) as session:
+            # Track pages are not ETag-cached: get_playlist_tracks_cached already stores them
+            async def fetch(offset: int) -> Dict:
+                async with session.get(url, params=dict(params, offset=offset)) as response:
+                    response.raise_for_status()
+                    return await response.json()
+            
+            return await asyncio.gather(*(fetch(offset) for offset in offsets))
+    
+    def _get_json(self, url: str, params: Optional[Dict] = None, conditional: bool = True) -> Dict:
+        """
+        Perform an authenticated, conditional GET request against the Spotify API.
+        
+        Responses carrying an ETag are cached on disk. Later requests for the same URL
+        send If-None-Match and reuse the cached body when Spotify answers 304.
+        
+        Args:
+            url: Request URL
+            params: Optional query parameters
+            conditional: Whether to use the ETag cache; disabled for playlist track
+                pages, which get_playlist_tracks_cached already stores
+            
+        Returns:
+            Dict: Decoded JSON response
+            
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        cache_path = self._response_cache_path(url, params) if conditional else None
+        cached = self._load_cached_response(cache_path) if conditional else None
+        headers = {"If-None-Match": cached["etag"]} if cached else None
+        
+        sent_token = self.access_token
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 401 and self._refresh_rejected_token(sent_token):
+            response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached["body"]
+        response.raise_for_status()
+        
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if conditional and etag:
+            self._save_cached_response(cache_path, etag, data)
+        return data
+    
+    def _response_cache_path(self, url: str, params: Optional[Dict] = None) -> Path:
+        """Return the cache file for a GET request, keyed by its full URL including the query."""
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        url_hash = hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+        return _CACHE_DIR / "responses" / f"{url_hash}.json"
+    
+    def _load_cached_response(self, cache_path: Path) -> Optional[Dict]:
+        """
+        Load a cached response.
+        
+        Args:
+            cache_path: Cache file from _response_cache_path
+            
+        Returns:
+            Dict: {'etag': ..., 'body': ...}, or None if nothing usable is cached
+        """
+        cached = _read_json_cache(cache_path)
+        if cached is None or not isinstance(cached.get("etag"), str) or not cached["etag"]:
+            return None
+        if not isinstance(cached.get("body"), dict):
+            return None
+        return cached
+    
+    def _save_cached_response(self, cache_path: Path, etag: str, body: Dict):
+        """Store a response body together with its ETag."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"etag": etag, "body": body}, f)
+        except OSError as e:
+            print(f"Warning: Could not cache API response: {e}", file=sys.stderr)
+    
+    def _collect_page_tracks(self, data: Dict, added_after: Optional[str], all_tracks: List[Dict]):
+        """
+        Append the tracks of one playlist page to all_tracks.
+        
+        Args:
+            data: Playlist tracks page from the Spotify API
+            added_after: Optional date filter (YYYY-MM-DD format)
+            all_tracks: List the matching track objects are appended to
+        """
+        for item in data.get("items", []):
+            track = item.get("track")
+            if track and track.get("id"):  # Skip null/deleted tracks
+                # If filtering by date, check the added_at field
+                if added_after:
+                    added_at = item.get("added_at")
+                    if added_at and self._is_track_added_after(added_at, added_after):
+                        all_tracks.append(track)
+                else:
+                    all_tracks.append(track)
     
     def _is_track_added_after(self, added_at: str, date_filter: str) -> bool:
         """
@@ -226,22 +617,17 @@ class SpotifyPlaylistExtractor:
         Returns:
             List[str]: List of Spotify track URLs
         """
-        urls = []
+        prefix = _TRACK_URL_PREFIX
+        urls = [
+            track.get("external_urls", {}).get("spotify") or prefix + track["id"]
+            for track in tracks
+            if track.get("id")
+        ]
         
+        # Warn about constructed URLs separately to keep the loop above branch-free
         for track in tracks:
-            # Get the external Spotify URL
-            external_urls = track.get("external_urls", {})
-            spotify_url = external_urls.get("spotify")
-            
-            if spotify_url:
-                urls.append(spotify_url)
-            else:
-                # Fallback: construct URL from track ID if available
-                track_id = track.get("id")
-                if track_id:
-                    fallback_url = f"https://open.spotify.com/track/{track_id}"
-                    urls.append(fallback_url)
-                    print(f"Warning: Using fallback URL for track: {track.get('name', 'Unknown')}", file=sys.stderr)
+            if track.get("id") and not track.get("external_urls", {}).get("spotify"):
+                print(f"Warning: Using fallback URL for track: {track.get('name', 'Unknown')}", file=sys.stderr)
         
         return urls
     
@@ -258,20 +644,13 @@ class SpotifyPlaylistExtractor:
         if not self.access_token:
             raise ValueError("Not authenticated. Call authenticate() first.")
         
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-        
         url = f"{self.base_url}/playlists/{playlist_id}"
         params = {
             "fields": "name,description,owner(display_name),tracks(total),external_urls"
         }
         
         try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(url, params)
         except requests.RequestException as e:
             print(f"✗ Error fetching playlist info: {e}", file=sys.stderr)
             return None
@@ -280,7 +659,10 @@ class SpotifyPlaylistExtractor:
 class SpotDLDownloader:
     """Handles MP3 downloads using spotDL."""
     
-    def __init__(self, output_dir: str = ".", overwrite: str = "skip", quality: str = "best"):
+    def __init__(self, output_dir: str = ".", overwrite: str = "skip", quality: str = "best", threads: int = 4,
+                 session: Optional[requests.Session] = None, client_id: Optional[str] = None,
+                 client_secret: Optional[str] = None, access_token: Optional[str] = None,
+                 token_expires_at: Optional[float] = None, use_api: bool = False):
         """
         Initialize SpotDL downloader.
         
@@ -288,10 +670,31 @@ class SpotDLDownloader:
             output_dir: Directory to save downloaded files
             overwrite: How to handle existing files ('skip', 'force', 'prompt')
             quality: Audio quality ('best', 'worst')
+            threads: Number of tracks to download in parallel
+            session: Optional HTTP session to reuse for checking track URLs
+            client_id: Optional Spotify client ID for spotDL
+            client_secret: Optional Spotify client secret for spotDL
+            access_token: Optional access token already obtained for these credentials,
+                handed to spotDL so it doesn't authenticate again
+            token_expires_at: Expiry time of access_token (seconds since the epoch)
+            use_api: Download through the in-process spotDL API instead of the spotdl
+                command (faster startup, but without timeout protection)
         """
         self.output_dir = Path(output_dir).expanduser().resolve()
         self.overwrite = overwrite
         self.quality = quality
+        self.threads = max(1, threads)
+        self.session = session or requests.Session()
+        # Track page checks must fail fast: no retries or Retry-After sleeps, one connection per worker
+        self.session.mount(
+            "https://open.spotify.com/",
+            HTTPAdapter(pool_maxsize=_PREFLIGHT_WORKERS, max_retries=0)
+        )
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self._print_lock = threading.Lock()
+        self._active_processes = set()
+        self._process_lock = threading.Lock()
         
         # Check if spotdl is available
         if not self._check_spotdl_available():
@@ -301,44 +704,201 @@ class SpotDLDownloader:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         print(f"✓ Download directory: {self.output_dir}", file=sys.stderr)
         
-        # Count existing MP3 files
-        existing_files = list(self.output_dir.glob("*.mp3"))
-        if existing_files:
-            print(f"ℹ️  Found {len(existing_files)} existing MP3 files in output directory", file=sys.stderr)
+        # Seed spotDL's token cache with our token so it skips its own authentication
+        self.token_cache_path = None
+        if access_token and token_expires_at:
+            self.token_cache_path = self._write_spotdl_token_cache(access_token, token_expires_at)
+        
+        # Optionally use the in-process spotDL API; the spotdl command is used when it is unavailable
+        self.sdl = None
+        if use_api and client_id and client_secret:
+            self.sdl = self._init_spotdl_api(client_id, client_secret)
+        
+        # Index existing MP3 files by normalized name for constant-time skip checks
+        self.existing_stems = set()
+        existing_count = 0
+        for path in self.output_dir.iterdir():
+            if path.suffix == ".mp3":
+                self.existing_stems.add(self._normalize_stem(path.stem))
+                existing_count += 1
+        if existing_count:
+            print(f"ℹ️  Found {existing_count} existing MP3 files in output directory", file=sys.stderr)
             if self.overwrite == "skip":
                 print("ℹ️  Existing files will be skipped automatically", file=sys.stderr)
     
-    def _check_spotdl_available(self) -> bool:
-        """Check if spotdl command is available."""
+    def _init_spotdl_api(self, client_id: str, client_secret: str):
+        """
+        Create an in-process spotDL client.
+        
+        Args:
+            client_id: Spotify client ID
+            client_secret: Spotify client secret
+            
+        Returns:
+            Spotdl: spotDL client, or None if the spotdl package can't be used in-process
+        """
+        try:
+            from spotdl import Spotdl
+        except ImportError:
+            return None
+        
         try:
-            result = subprocess.run(
-                ["spotdl", "--version"], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
+            return Spotdl(
+                client_id=client_id,
+                client_secret=client_secret,
+                cache_path=self.token_cache_path,
+                downloader_settings={
+                    "output": str(self.output_dir / "{artists} - {title}.{output-ext}"),
+                    "threads": self.threads,
+                    # spotDL has no interactive prompt mode, so 'prompt' keeps existing files
+                    "overwrite": "force" if self.overwrite == "force" else "skip"
+                }
             )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            # Try python module approach
+        except Exception as e:
+            print(f"Warning: spotDL Python API unavailable, using spotdl command instead: {e}", file=sys.stderr)
+            return None
+    
+    def _write_spotdl_token_cache(self, access_token: str, token_expires_at: float) -> Optional[str]:
+        """
+        Write an access token in the spotipy cache format used by spotDL.
+        
+        Args:
+            access_token: Spotify access token
+            token_expires_at: Expiry time of the token (seconds since the epoch)
+            
+        Returns:
+            str: Path of the cache file, or None if it could not be written
+        """
+        client_hash = hashlib.sha256((self.client_id or "").encode("utf-8")).hexdigest()
+        cache_path = _CACHE_DIR / f"spotdl-token-{client_hash}.json"
+        token_info = {
+            "access_token": access_token,
+            "token_type": "Bearer",
+            "expires_in": max(0, int(token_expires_at - time.time())),
+            "expires_at": int(token_expires_at)
+        }
+        
+        try:
+            _write_private_json(cache_path, token_info)
+        except OSError as e:
+            print(f"Warning: Could not share access token with spotDL: {e}", file=sys.stderr)
+            return None
+        
+        return str(cache_path)
+    
+    def _check_spotdl_available(self) -> bool:
+        """
+        Check if spotdl is available, without starting it.
+        
+        Sets self.spotdl_cmd to the spotdl executable, or to running the spotdl module
+        with the current Python interpreter if only the package is installed.
+        """
+        if shutil.which("spotdl"):
+            self.spotdl_cmd = ["spotdl"]
+            return True
+        if importlib.util.find_spec("spotdl") is not None:
+            self.spotdl_cmd = [sys.executable, "-m", "spotdl"]
+            return True
+        return False
+    
+    def _spawn_spotdl(self, args: List[str]) -> subprocess.Popen:
+        """
+        Start a spotdl download process in the output directory.
+        
+        Args:
+            args: Options followed by the track URLs to download
+            
+        Returns:
+            subprocess.Popen: Process with stdout and stderr merged into a text pipe
+        """
+        cmd = self.spotdl_cmd + ["download"]
+        if self.client_id and self.client_secret:
+            cmd += ["--client-id", self.client_id, "--client-secret", self.client_secret]
+        if self.token_cache_path:
+            cmd += ["--cache-path", self.token_cache_path]
+        
+        # Run spotdl in its own process group so its ffmpeg/yt-dlp children can be killed with it
+        if os.name == "nt":
+            group_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group_kwargs = {"start_new_session": True}
+        
+        process = subprocess.Popen(
+            cmd + args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            # spotdl prints UTF-8; never let an undecodable byte abort the download
+            encoding="utf-8",
+            errors="replace",
+            cwd=str(self.output_dir),  # Set working directory to output directory
+            close_fds=True,
+            **group_kwargs
+        )
+        with self._process_lock:
+            self._active_processes.add(process)
+        return process
+    
+    def _kill_process(self, process: subprocess.Popen):
+        """
+        Stop a spotdl process together with every process it started.
+        
+        The process group is asked to terminate first and killed if it is still
+        running after two seconds.
+        
+        Args:
+            process: Process started by _spawn_spotdl
+        """
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+        else:
+            # The process leads its own session, so its group ID equals its PID
             try:
-                result = subprocess.run(
-                    [sys.executable, "-m", "spotdl", "--version"], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=10
-                )
-                return result.returncode == 0
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                return False
+                os.killpg(process.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+            # Grandchildren may ignore SIGTERM or outlive the leader
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        
+        process.wait()
+        self._release_process(process)
+    
+    def _release_process(self, process: subprocess.Popen):
+        """Forget a spotdl process that has finished."""
+        with self._process_lock:
+            self._active_processes.discard(process)
+    
+    def _kill_active_processes(self):
+        """Stop all running spotdl processes, e.g. when the user interrupts the download."""
+        with self._process_lock:
+            processes = list(self._active_processes)
+        for process in processes:
+            self._kill_process(process)
     
-    def download_tracks(self, track_urls: List[str], progress_callback=None, timeout_seconds: int = 20) -> Tuple[List[str], List[str]]:
+    def download_tracks(self, track_urls: List[str], progress_callback=None, timeout_seconds: int = 20,
+                        tracks: Optional[List[Dict]] = None) -> Tuple[List[str], List[str]]:
         """
-        Download tracks using spotDL with timeout protection.
+        Download tracks using a single batched spotDL invocation with timeout protection.
+        
+        URLs are handed to spotdl in large batches so startup and authentication are paid
+        once per batch and spotdl can download tracks in parallel. Tracks whose outcome
+        cannot be confirmed from a batch run are retried one by one. When the downloader
+        was created with use_api, tracks go through the in-process spotDL API instead,
+        without timeout protection.
         
         Args:
             track_urls: List of Spotify track URLs
             progress_callback: Optional callback function for progress updates
-            timeout_seconds: Maximum time to wait for each individual track download
+            timeout_seconds: Maximum time without spotDL output before the batch is stopped,
+                and maximum time to wait for each individually retried track
+            tracks: Optional track objects (with name and artists) matching track_urls;
+                when given, tracks whose MP3 already exists are skipped without running spotdl
             
         Returns:
             Tuple[List[str], List[str]]: (successful_downloads, failed_downloads)
@@ -347,70 +907,388 @@ class SpotDLDownloader:
             print("No tracks to download", file=sys.stderr)
             return [], []
         
-        print(f"Starting download of {len(track_urls)} tracks (timeout: {timeout_seconds}s per track)...", file=sys.stderr)
+        # Download tracks that appear several times in the playlist only once
+        seen = set()
+        unique = [i for i, track_url in enumerate(track_urls) if not (track_url in seen or seen.add(track_url))]
+        if len(unique) < len(track_urls):
+            print(f"ℹ️  Ignoring {len(track_urls) - len(unique)} duplicate tracks", file=sys.stderr)
+            if tracks is not None and len(tracks) == len(track_urls):
+                tracks = [tracks[i] for i in unique]
+            track_urls = [track_urls[i] for i in unique]
         
-        # Prepare simple spotdl command
-        base_cmd = ["spotdl", "download"]
+        total = len(track_urls)
+        skipped = []
+        if tracks is not None and len(tracks) == total and self.overwrite == "skip":
+            remaining = []
+            for track_url, track in zip(track_urls, tracks):
+                if any(stem in self.existing_stems for stem in self._expected_stems(track)):
+                    skipped.append(track_url)
+                else:
+                    remaining.append(track_url)
+            track_urls = remaining
+            
+            if skipped:
+                print(f"ℹ️  Skipping {len(skipped)} tracks that are already downloaded", file=sys.stderr)
+                if progress_callback:
+                    progress_callback(len(skipped), total)
+            if not track_urls:
+                return skipped, []
         
-        successful_downloads = []
-        failed_downloads = []
+        # Removed tracks fail right away instead of after a spotdl timeout
+        track_urls, missing = self._preflight_check(track_urls)
+        if missing:
+            _write_stderr(
+                [f"✗ {len(missing)} tracks no longer exist on Spotify"]
+                + [f"    {track_url}" for track_url in missing]
+            )
+            if progress_callback:
+                progress_callback(len(skipped) + len(missing), total)
+        if not track_urls:
+            return skipped, missing
+        
+        print(f"Starting download of {len(track_urls)} tracks (timeout: {timeout_seconds}s without progress)...", file=sys.stderr)
+        
+        batch_progress = None
+        if progress_callback:
+            def batch_progress(completed: int, _batch_total: int):
+                progress_callback(len(skipped) + len(missing) + completed, total)
+        
+        result = None
+        if self.sdl is not None:
+            result = self._download_in_process(track_urls, batch_progress)
+        if result is None:
+            result = self._download_batch(track_urls, batch_progress, timeout_seconds)
+        
+        successful_downloads, failed_downloads, pending = result
+        successful_downloads = skipped + successful_downloads
+        failed_downloads = missing + failed_downloads
         
-        # Download tracks one by one to enable per-track timeout
-        for i, track_url in enumerate(track_urls, 1):
-            print(f"Downloading track {i}/{len(track_urls)}: {track_url}", file=sys.stderr)
+        if pending:
+            print(f"Retrying {len(pending)} unconfirmed tracks individually...", file=sys.stderr)
+        
+        # Download remaining tracks individually to enable per-track timeout
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            futures = {
+                executor.submit(self._download_one, track_url, timeout_seconds): track_url
+                for track_url in pending
+            }
             
-            # Create command for this specific track - URL must come at the end
-            track_cmd = base_cmd + [track_url]
+            try:
+                for future in as_completed(futures):
+                    track_url = futures[future]
+                    try:
+                        _, ok, stdout = future.result()
+                    except Exception as e:
+                        with self._print_lock:
+                            print(f"  ✗ Error downloading {track_url}: {e}", file=sys.stderr)
+                        failed_downloads.append(track_url)
+                    else:
+                        if ok:
+                            successful_downloads.append(track_url)
+                        else:
+                            failed_downloads.append(track_url)
+                        self._report_track(track_url, ok, stdout, timeout_seconds)
+                    
+                    # Call progress callback
+                    if progress_callback:
+                        progress_callback(len(successful_downloads) + len(failed_downloads), total)
+            except KeyboardInterrupt:
+                # spotdl runs in its own process group and doesn't receive the interrupt itself
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._kill_active_processes()
+                raise
+        
+        return successful_downloads, failed_downloads
+    
+    def _preflight_check(self, track_urls: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Check in parallel which track pages still exist on Spotify.
+        
+        Only a 404 response marks a track as missing; network errors and other
+        responses leave the track to spotdl.
+        
+        Args:
+            track_urls: List of Spotify track URLs
             
+        Returns:
+            Tuple[List[str], List[str]]: (reachable_urls, missing_urls)
+        """
+        def is_missing(track_url: str) -> bool:
+            if not track_url.startswith(_TRACK_URL_PREFIX):
+                return False
             try:
-                # Run spotdl command with timeout
-                process = subprocess.Popen(
-                    track_cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    cwd=str(self.output_dir)  # Set working directory to output directory
+                # Don't send the Web API bearer token to the public web player
+                response = self.session.head(
+                    track_url, headers={"Authorization": None}, allow_redirects=True, timeout=5
                 )
-                
-                try:
-                    # Wait for process to complete with timeout
-                    stdout, _ = process.communicate(timeout=timeout_seconds)
+            except requests.RequestException:
+                return False
+            return response.status_code == 404
+        
+        with ThreadPoolExecutor(max_workers=_PREFLIGHT_WORKERS) as executor:
+            results = list(executor.map(is_missing, track_urls))
+        
+        reachable = [url for url, missing in zip(track_urls, results) if not missing]
+        missing = [url for url, missing in zip(track_urls, results) if missing]
+        return reachable, missing
+    
+    @staticmethod
+    def _normalize_stem(stem: str) -> str:
+        """Reduce a file name to lowercase letters and digits so punctuation differences don't matter."""
+        return "".join(ch for ch in stem.casefold() if ch.isalnum())
+    
+    def _expected_stems(self, track: Dict) -> List[str]:
+        """
+        Build the normalized file names spotdl would use for a track.
+        
+        Args:
+            track: Track object with name and artists
+            
+        Returns:
+            List[str]: Candidates for the '{artists} - {title}' and '{artist} - {title}' templates
+        """
+        name = track.get("name")
+        artists = [artist.get("name", "") for artist in track.get("artists", [])]
+        if not name or not artists:
+            return []
+        
+        return [
+            self._normalize_stem(f"{', '.join(artists)} - {name}"),
+            self._normalize_stem(f"{artists[0]} - {name}")
+        ]
+    
+    def _download_one(self, track_url: str, timeout_seconds: int) -> Tuple[str, bool, Optional[str]]:
+        """
+        Download a single track with its own spotdl process.
+        
+        Args:
+            track_url: Spotify track URL
+            timeout_seconds: Maximum time to wait for the download
+            
+        Returns:
+            Tuple[str, bool, Optional[str]]: (track_url, success, spotdl output or None on timeout)
+        """
+        with self._print_lock:
+            print(f"Downloading track: {track_url}", file=sys.stderr)
+        
+        # URL must come at the end
+        process = self._spawn_spotdl([track_url])
+        
+        try:
+            # Wait for process to complete with timeout
+            stdout, _ = process.communicate(timeout=timeout_seconds)
+        except subprocess.TimeoutExpired:
+            # Kill the process and its children if it times out
+            self._kill_process(process)
+            return track_url, False, None
+        except BaseException:
+            # spotdl runs in its own process group, so nothing else would stop it
+            self._kill_process(process)
+            raise
+        
+        self._release_process(process)
+        return track_url, process.returncode == 0, stdout
+    
+    def _report_track(self, track_url: str, ok: bool, stdout: Optional[str], timeout_seconds: int):
+        """Print the outcome of an individually downloaded track with relevant spotdl output."""
+        if stdout is None:
+            lines = [f"  ⏰ {track_url} timed out after {timeout_seconds} seconds - skipping"]
+        else:
+            if ok:
+                lines = [f"  ✓ {track_url} downloaded successfully"]
+                keywords = ['saved', 'converting', 'found', 'skipping']
+            else:
+                lines = [f"  ✗ {track_url} failed"]
+                keywords = ['error', 'failed', 'not found', 'skipping']
+            
+            # Show relevant output lines
+            for line in stdout.splitlines():
+                line = line.strip()
+                if any(keyword in line.lower() for keyword in keywords):
+                    lines.append(f"    {line}")
+        
+        with self._print_lock:
+            _write_stderr(lines)
+    
+    def _download_in_process(self, track_urls: List[str], progress_callback) -> Optional[Tuple[List[str], List[str], List[str]]]:
+        """
+        Download all tracks with the in-process spotDL API.
+        
+        Songs are downloaded in groups of self.threads. Stalled downloads can't be
+        interrupted in-process, so no timeout applies.
+        
+        Args:
+            track_urls: List of Spotify track URLs
+            progress_callback: Optional callback function for progress updates
+            
+        Returns:
+            Tuple[List[str], List[str], List[str]]: (successful, failed, pending), or None
+            if the API failed and the spotdl command should be used instead
+        """
+        try:
+            songs = self.sdl.search(track_urls)
+        except Exception as e:
+            print(f"Warning: spotDL Python API failed, using spotdl command instead: {e}", file=sys.stderr)
+            return None
+        
+        total = len(track_urls)
+        completed = 0
+        downloaded_ids = set()
+        
+        # Download a group of songs at a time so spotDL can work in parallel while
+        # progress is still reported as songs finish
+        for start in range(0, len(songs), self.threads):
+            try:
+                results = self.sdl.download_songs(songs[start:start + self.threads])
+            except Exception as e:
+                print(f"✗ spotDL Python API failed: {e}", file=sys.stderr)
+                results = []
+            
+            for song, path in results:
+                if path is not None:
+                    downloaded_ids.add(song.song_id)
+                    print(f"  ✓ Downloaded {song.display_name}", file=sys.stderr)
+                else:
+                    print(f"  ✗ Failed {song.display_name}", file=sys.stderr)
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total)
+        
+        successful = []
+        failed = []
+        for track_url in track_urls:
+            track_id = track_url.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+            if track_id in downloaded_ids:
+                successful.append(track_url)
+            else:
+                failed.append(track_url)
+        
+        if progress_callback:
+            progress_callback(total, total)
+        return successful, failed, []
+    
+    def _download_batch(self, track_urls: List[str], progress_callback, timeout_seconds: int) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Download all tracks with as few spotdl processes as possible.
+        
+        Tracks are split into batches of at most _BATCH_SIZE URLs so the command line
+        stays within operating system limits.
+        
+        Args:
+            track_urls: List of Spotify track URLs
+            progress_callback: Optional callback function for progress updates
+            timeout_seconds: Maximum time without spotDL output before a process is killed
+            
+        Returns:
+            Tuple[List[str], List[str], List[str]]: (successful, failed, pending)
+        """
+        total = len(track_urls)
+        successful = []
+        failed = []
+        pending = []
+        
+        for start in range(0, total, _BATCH_SIZE):
+            batch_progress = None
+            if progress_callback:
+                def batch_progress(completed: int, _batch_total: int, done_before: int = start):
+                    progress_callback(done_before + completed, total)
+            
+            batch_successful, batch_failed, batch_pending = self._download_chunk(
+                track_urls[start:start + _BATCH_SIZE], batch_progress, timeout_seconds
+            )
+            successful += batch_successful
+            failed += batch_failed
+            pending += batch_pending
+        
+        return successful, failed, pending
+    
+    def _download_chunk(self, track_urls: List[str], progress_callback, timeout_seconds: int) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Download a batch of tracks with one spotdl process, stopping it if it stalls.
+        
+        Failed tracks are read from spotdl's --save-errors file. The remaining tracks are
+        only reported as successful when spotdl confirmed as many tracks as expected and
+        exited cleanly; otherwise they are returned as pending.
+        
+        Args:
+            track_urls: List of Spotify track URLs
+            progress_callback: Optional callback function for progress updates
+            timeout_seconds: Maximum time without spotDL output before the process is killed
+            
+        Returns:
+            Tuple[List[str], List[str], List[str]]: (successful, failed, pending)
+        """
+        total = len(track_urls)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            errors_file = os.path.join(tmp_dir, "errors.txt")
+            
+            try:
+                process = self._spawn_spotdl(
+                    ["--threads", str(self.threads), "--save-errors", errors_file] + track_urls
+                )
+            except OSError as e:
+                print(f"  ✗ Error starting batch download: {e}", file=sys.stderr)
+                return [], [], list(track_urls)
+            
+            last_output = [time.monotonic()]
+            finished = threading.Event()
+            stalled = threading.Event()
+            
+            def watchdog():
+                while not finished.wait(1):
+                    if time.monotonic() - last_output[0] > timeout_seconds:
+                        stalled.set()
+                        self._kill_process(process)
+                        return
+            
+            threading.Thread(target=watchdog, daemon=True).start()
+            
+            confirmed = 0
+            errored = 0
+            try:
+                for line in process.stdout:
+                    last_output[0] = time.monotonic()
+                    line = line.strip()
+                    if not line:
+                        continue
                     
-                    if process.returncode == 0:
-                        successful_downloads.append(track_url)
-                        print(f"  ✓ Track {i} downloaded successfully", file=sys.stderr)
-                        
-                        # Show relevant output lines
-                        for line in stdout.splitlines():
-                            line = line.strip()
-                            if any(keyword in line.lower() for keyword in ['saved', 'converting', 'found', 'skipping']):
-                                print(f"    {line}", file=sys.stderr)
+                    if _SPOTDL_DONE_RE.match(line):
+                        confirmed += 1
+                    elif _SPOTDL_ERROR_RE.search(line):
+                        errored += 1
                     else:
-                        failed_downloads.append(track_url)
-                        print(f"  ✗ Track {i} failed (exit code: {process.returncode})", file=sys.stderr)
-                        
-                        # Show error output
-                        for line in stdout.splitlines():
-                            line = line.strip()
-                            if any(keyword in line.lower() for keyword in ['error', 'failed', 'not found', 'skipping']):
-                                print(f"    {line}", file=sys.stderr)
-                                
-                except subprocess.TimeoutExpired:
-                    # Kill the process if it times out
-                    process.kill()
-                    process.wait()
-                    failed_downloads.append(track_url)
-                    print(f"  ⏰ Track {i} timed out after {timeout_seconds} seconds - skipping", file=sys.stderr)
+                        continue
                     
-            except Exception as e:
-                print(f"  ✗ Error downloading track {i}: {e}", file=sys.stderr)
-                failed_downloads.append(track_url)
+                    print(f"  {line}", file=sys.stderr)
+                    if progress_callback:
+                        progress_callback(min(confirmed + errored, total), total)
+                process.wait()
+            except BaseException:
+                # spotdl runs in its own process group, so nothing else would stop it
+                self._kill_process(process)
+                raise
+            finally:
+                finished.set()
+                self._release_process(process)
             
-            # Call progress callback
-            if progress_callback:
-                progress_callback(len(successful_downloads) + len(failed_downloads), len(track_urls))
+            failed_urls = set()
+            if os.path.exists(errors_file):
+                with open(errors_file, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        failed_urls.add(line.split(" ", 1)[0].strip())
         
-        return successful_downloads, failed_downloads
+        failed = [url for url in track_urls if url in failed_urls]
+        remaining = [url for url in track_urls if url not in failed_urls]
+        
+        if stalled.is_set():
+            print(f"  ⏰ Batch download stalled for {timeout_seconds} seconds - stopping", file=sys.stderr)
+            return [], failed, remaining
+        
+        if process.returncode == 0 and confirmed >= len(remaining):
+            return remaining, failed, []
+        
+        return [], failed, remaining
     
     def download_single_track(self, track_url: str) -> bool:
         """
@@ -430,13 +1308,21 @@ def load_credentials_from_env(env_file: str = ".env") -> tuple[str, str]:
     """
     Load Spotify credentials from environment file.
     
+    If both credentials are already set as environment variables, the .env file
+    is not read. Otherwise values from the .env file take precedence.
+    
     Args:
         env_file: Path to .env file
         
     Returns:
         tuple: (client_id, client_secret)
     """
-    # First try to load from .env file in the script directory
+    env_client_id = os.environ.get('SPOTIFY_CLIENT_ID') or os.environ.get('SPOTIFY-CLIENT-ID')
+    env_client_secret = os.environ.get('SPOTIFY_CLIENT_SECRET') or os.environ.get('SPOTIFY-CLIENT-SECRET')
+    if env_client_id and env_client_secret:
+        return env_client_id, env_client_secret
+    
+    # Load from .env file in the script directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     env_path = os.path.join(script_dir, env_file)
     
@@ -444,25 +1330,25 @@ def load_credentials_from_env(env_file: str = ".env") -> tuple[str, str]:
     client_secret = None
     
     if os.path.exists(env_path):
-        with open(env_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip().strip('"\'')
-                        
-                        if key in ['SPOTIFY_CLIENT_ID', 'SPOTIFY-CLIENT-ID']:
-                            client_id = value
-                        elif key in ['SPOTIFY_CLIENT_SECRET', 'SPOTIFY-CLIENT-SECRET']:
-                            client_secret = value
+        for line in Path(env_path).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    key = key.strip()
+                    value = value.strip().strip('"\'')
+                    
+                    if key in ['SPOTIFY_CLIENT_ID', 'SPOTIFY-CLIENT-ID']:
+                        client_id = value
+                    elif key in ['SPOTIFY_CLIENT_SECRET', 'SPOTIFY-CLIENT-SECRET']:
+                        client_secret = value
+                    
+                    if client_id and client_secret:
+                        break
     
     # Fallback to environment variables
-    if not client_id:
-        client_id = os.environ.get('SPOTIFY_CLIENT_ID') or os.environ.get('SPOTIFY-CLIENT-ID')
-    if not client_secret:
-        client_secret = os.environ.get('SPOTIFY_CLIENT_SECRET') or os.environ.get('SPOTIFY-CLIENT-SECRET')
+    client_id = client_id or env_client_id
+    client_secret = client_secret or env_client_secret
     
     if not client_id or not client_secret:
         raise ValueError(
@@ -473,6 +1359,69 @@ def load_credentials_from_env(env_file: str = ".env") -> tuple[str, str]:
     return client_id, client_secret
 
 
+def _iter_track_dicts(tracks: List[Dict]):
+    """Yield the JSON output record for each track object."""
+    for track in tracks:
+        yield {
+            "name": track.get("name"),
+            "artists": [artist.get("name") for artist in track.get("artists", [])],
+            "url": track.get("external_urls", {}).get("spotify"),
+            "id": track.get("id"),
+            "uri": track.get("uri")
+        }
+
+
+def write_tracks_json(playlist_id: str, tracks: List[Dict], out=None):
+    """
+    Write tracks as indented JSON one record at a time.
+    
+    The output matches json.dumps(..., indent=2) of the whole document without
+    building the full list of track records in memory first.
+    
+    Args:
+        playlist_id: Spotify playlist ID
+        tracks: List of track objects from Spotify API
+        out: Writable text stream (default: sys.stdout)
+    """
+    out = out or sys.stdout
+    
+    out.write("{\n")
+    out.write(f'  "playlist_id": {json.dumps(playlist_id)},\n')
+    out.write(f'  "total_tracks": {len(tracks)},\n')
+    if not tracks:
+        out.write('  "tracks": []\n}\n')
+        return
+    
+    out.write('  "tracks": [\n')
+    for i, record in enumerate(_iter_track_dicts(tracks)):
+        if i:
+            out.write(",\n")
+        out.write("    " + json.dumps(record, indent=2).replace("\n", "\n    "))
+    out.write("\n  ]\n}\n")
+
+
+def write_tracks_csv(tracks: List[Dict], out=None):
+    """
+    Write tracks as CSV with a header row.
+    
+    Args:
+        tracks: List of track objects from Spotify API
+        out: Writable text stream (default: sys.stdout)
+    """
+    writer = csv.writer(out or sys.stdout, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+    writer.writerow(["name", "artists", "url", "id", "uri"])
+    writer.writerows(
+        (
+            track.get("name", ""),
+            "; ".join(artist.get("name", "") for artist in track.get("artists", [])),
+            track.get("external_urls", {}).get("spotify", ""),
+            track.get("id", ""),
+            track.get("uri", "")
+        )
+        for track in tracks
+    )
+
+
 def main():
     """Main function to run the playlist extractor and downloader."""
     parser = argparse.ArgumentParser(
@@ -539,7 +1488,19 @@ Examples:
         "--timeout",
         type=int,
         default=20,
-        help="Timeout in seconds for each individual track download (default: 20)"
+        help="Timeout in seconds without download progress before a track is given up on (default: 20)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Number of tracks to download in parallel (default: 4)"
+    )
+    parser.add_argument(
+        "--spotdl-api",
+        action="store_true",
+        help="Download through spotDL's Python API instead of the spotdl command "
+             "(faster startup, but --timeout does not apply)"
     )
     parser.add_argument(
         "--added-after",
@@ -587,8 +1548,9 @@ Examples:
                 print(f"✗ Invalid date format: {args.added_after}. Please use YYYY-MM-DD format (e.g., 2023-01-15)", file=sys.stderr)
                 sys.exit(1)
         
-        # Get tracks
-        tracks = extractor.get_playlist_tracks(playlist_id, args.added_after)
+        # Get tracks, with names and artists only when they are shown or used to skip existing files
+        fields = "full" if args.download or args.format in ("json", "csv") else "minimal"
+        tracks = extractor.get_playlist_tracks_cached(playlist_id, args.added_after, fields=fields)
         
         if not tracks:
             print("No tracks found in playlist", file=sys.stderr)
@@ -603,30 +1565,9 @@ Examples:
                 for url in urls:
                     print(url)
             elif args.format == "json":
-                output = {
-                    "playlist_id": playlist_id,
-                    "total_tracks": len(tracks),
-                    "tracks": [
-                        {
-                            "name": track.get("name"),
-                            "artists": [artist.get("name") for artist in track.get("artists", [])],
-                            "url": track.get("external_urls", {}).get("spotify"),
-                            "id": track.get("id"),
-                            "uri": track.get("uri")
-                        }
-                        for track in tracks
-                    ]
-                }
-                print(json.dumps(output, indent=2))
+                write_tracks_json(playlist_id, tracks)
             elif args.format == "csv":
-                print("name,artists,url,id,uri")
-                for track in tracks:
-                    name = track.get("name", "").replace('"', '""')
-                    artists = "; ".join([artist.get("name", "") for artist in track.get("artists", [])])
-                    url = track.get("external_urls", {}).get("spotify", "")
-                    track_id = track.get("id", "")
-                    uri = track.get("uri", "")
-                    print(f'"{name}","{artists}","{url}","{track_id}","{uri}"')
+                write_tracks_csv(tracks)
         
         # Download MP3s if requested
         if args.download and not args.urls_only:
@@ -646,22 +1587,34 @@ Examples:
                 downloader = SpotDLDownloader(
                     output_dir=output_dir,
                     overwrite=args.overwrite,
-                    quality=args.quality
+                    quality=args.quality,
+                    threads=args.threads,
+                    session=extractor.session,
+                    client_id=client_id,
+                    client_secret=client_secret,
+                    access_token=extractor.access_token,
+                    token_expires_at=extractor.token_expires_at,
+                    use_api=args.spotdl_api
                 )
                 
                 def progress_callback(completed: int, total: int):
                     percent = (completed / total) * 100
                     print(f"Progress: {completed}/{total} ({percent:.1f}%)", file=sys.stderr)
                 
-                successful, failed = downloader.download_tracks(urls, progress_callback, timeout_seconds=args.timeout)
+                successful, failed = downloader.download_tracks(
+                    urls, progress_callback, timeout_seconds=args.timeout, tracks=tracks
+                )
                 
-                print("\n" + "="*50, file=sys.stderr)
-                print("Download Summary:", file=sys.stderr)
-                print(f"✓ Successfully downloaded: {len(successful)} tracks", file=sys.stderr)
+                summary = [
+                    "\n" + "="*50,
+                    "Download Summary:",
+                    f"✓ Successfully downloaded: {len(successful)} tracks"
+                ]
                 if failed:
-                    print(f"✗ Failed downloads: {len(failed)} tracks", file=sys.stderr)
-                print(f"📁 Files saved to: {downloader.output_dir}", file=sys.stderr)
-                print("="*50, file=sys.stderr)
+                    summary.append(f"✗ Failed downloads: {len(failed)} tracks")
+                summary.append(f"📁 Files saved to: {downloader.output_dir}")
+                summary.append("="*50)
+                _write_stderr(summary)
                 
             except RuntimeError as e:
                 print(f"✗ Download error: {e}", file=sys.stderr)